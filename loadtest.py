@@ -0,0 +1,348 @@
+"""
+Load test for the InTheLoop API.
+
+By default starts a local stand-in feed server and the Flask app in-process
+(with its feeds pointed at the stand-in); with --target it drives an app that
+is already running instead. Virtual users replay a mix of category browsing,
+search keystrokes, trending polls, feed-list views and periodic refreshes.
+Reports throughput, latency percentiles per endpoint, response-cache hits and
+how many crawls the app ran (read from /api/health).
+
+Usage:
+    python loadtest.py --users 20 --duration 60
+    python loadtest.py --ttl 15 --duration 60        # let cache expiry land mid-run
+    python loadtest.py --max-p99-ms 500 --max-crawls 3   # exit 1 on regression
+    python loadtest.py --target http://localhost:8000    # e.g. gunicorn workers
+"""
+import argparse
+import email.utils
+import json
+import logging
+import math
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# The app under test must not touch the real snapshot or crawl on import
+os.environ['INTHELOOP_MODE'] = 'standalone'
+os.environ['INTHELOOP_WARM_START'] = 'off'
+
+import requests
+from werkzeug.serving import make_server
+
+import main
+
+# Words the stand-in feeds are written from, with a few recurring phrases so
+# trending analysis has something realistic to find
+VOCABULARY = (
+    'market', 'election', 'climate', 'startup', 'quantum', 'vaccine', 'league',
+    'album', 'earnings', 'satellite', 'merger', 'playoff', 'policy', 'battery',
+    'festival', 'research', 'inflation', 'robotics', 'premiere', 'hospital',
+    'semiconductor', 'tournament', 'regulators', 'streaming', 'wildfire'
+)
+PHRASES = ('interest rates', 'artificial intelligence', 'supply chain', 'box office', 'space station')
+
+SEARCH_TERMS = ('quantum', 'climate', 'market', 'election', 'festival')
+
+# Scenario name -> relative weight in the traffic mix
+TRAFFIC_MIX = {
+    'index': 5,
+    'browse': 40,
+    'search': 20,
+    'trending': 25,
+    'feeds': 8,
+    'refresh': 2,
+}
+
+
+# ==================== Stand-in Feed Server ====================
+
+class FeedHandler(BaseHTTPRequestHandler):
+    """Serves a deterministic RSS feed for any path"""
+
+    protocol_version = 'HTTP/1.1'
+    latency = 0.0
+    items = 20
+    hits = 0
+    hits_lock = threading.Lock()
+
+    def do_GET(self):
+        with FeedHandler.hits_lock:
+            FeedHandler.hits += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        body = build_feed(self.path, self.items).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/rss+xml; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def build_feed(path, items):
+    """RSS document for path with items entries spread over the last 36 hours"""
+    rng = random.Random(path)
+    now = time.time()
+    entries = []
+    for i in range(items):
+        words = rng.sample(VOCABULARY, 6)
+        title = f"{words[0].title()} {rng.choice(PHRASES)} {words[1]} {words[2]}"
+        summary = f"&lt;p&gt;{' '.join(words)} {rng.choice(PHRASES)} &lt;b&gt;{words[3]}&lt;/b&gt;&lt;/p&gt;"
+        published = email.utils.formatdate(now - rng.uniform(0, 36 * 60 * 60))
+        entries.append(
+            f"<item><title>{title}</title><link>https://example.com{path}/{i}</link>"
+            f"<description>{summary}</description><pubDate>{published}</pubDate></item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel>'
+        f"<title>Stand-in {path}</title><link>https://example.com{path}</link>"
+        f"{''.join(entries)}</channel></rss>"
+    )
+
+
+def start_feed_server(latency, items):
+    """Start the stand-in feed server on a free port; returns its base URL"""
+    FeedHandler.latency = latency
+    FeedHandler.items = items
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FeedHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+# ==================== App Under Test ====================
+
+def start_app(feed_base, feeds_per_category, args):
+    """Point the app at the stand-in feeds and serve it on a free port"""
+    for category in main.rss_feeds:
+        slug = category.lower().replace(' ', '-')
+        main.rss_feeds[category] = [f"{feed_base}/{slug}/{n}" for n in range(feeds_per_category)]
+
+    if args.ttl:
+        main.CACHE_TTL = timedelta(seconds=args.ttl)
+    # Every stand-in feed shares one host, so the real politeness limits would
+    # measure the limiter rather than the app
+    if not args.polite:
+        main.PER_HOST_CONCURRENCY = main.FETCH_WORKERS
+        main.PER_HOST_MIN_INTERVAL = 0
+    if args.no_rate_limit:
+        main.RATE_LIMITS = {bucket: (10 ** 9, 10 ** 9) for bucket in main.RATE_LIMITS}
+
+    server = make_server('127.0.0.1', 0, main.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+# ==================== Virtual Users ====================
+
+class Stats:
+    """Latencies, status codes and cache hits per endpoint, shared by all users"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.cache_hits = Counter()
+        self.errors = Counter()
+
+    def record(self, endpoint, seconds, response):
+        with self.lock:
+            self.latencies[endpoint].append(seconds)
+            self.statuses[endpoint][response.status_code] += 1
+            if response.headers.get('X-Cache') == 'HIT':
+                self.cache_hits[endpoint] += 1
+
+    def record_error(self, endpoint, error):
+        with self.lock:
+            self.errors[f"{endpoint}: {type(error).__name__}"] += 1
+
+
+def run_user(base_url, categories, stats, deadline, think_time, seed):
+    """Replay scenarios from TRAFFIC_MIX until deadline"""
+    rng = random.Random(seed)
+    session = requests.Session()
+    scenarios = list(TRAFFIC_MIX)
+    weights = [TRAFFIC_MIX[s] for s in scenarios]
+
+    def get(endpoint, path, **params):
+        started = time.perf_counter()
+        try:
+            response = session.get(base_url + path, params=params, timeout=60)
+        except requests.RequestException as e:
+            stats.record_error(endpoint, e)
+            return
+        stats.record(endpoint, time.perf_counter() - started, response)
+
+    while time.monotonic() < deadline:
+        scenario = rng.choices(scenarios, weights)[0]
+        if scenario == 'index':
+            get('index', '/')
+        elif scenario == 'browse':
+            get('articles', '/api/articles', category=rng.choice(categories))
+        elif scenario == 'search':
+            # One request per keystroke, as a server-side search box would send
+            term = rng.choice(SEARCH_TERMS)
+            for end in range(2, len(term) + 1):
+                get('articles?search', '/api/articles', search=term[:end])
+                time.sleep(rng.uniform(0.05, 0.15))
+        elif scenario == 'trending':
+            get('trending', '/api/trending')
+        elif scenario == 'feeds':
+            get('feeds', '/api/feeds')
+        elif scenario == 'refresh':
+            get('refresh', '/api/refresh')
+        time.sleep(rng.uniform(0, think_time))
+
+
+# ==================== Report ====================
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def build_report(stats, elapsed, feed_hits, feeds_total, crawls):
+    """Summary dictionary for printing or --json output"""
+    endpoints = {}
+    total = 0
+    for endpoint in sorted(stats.latencies):
+        values = sorted(stats.latencies[endpoint])
+        total += len(values)
+        endpoints[endpoint] = {
+            'requests': len(values),
+            'rps': round(len(values) / elapsed, 1),
+            'p50_ms': round(percentile(values, 50) * 1000, 1),
+            'p90_ms': round(percentile(values, 90) * 1000, 1),
+            'p99_ms': round(percentile(values, 99) * 1000, 1),
+            'max_ms': round(values[-1] * 1000, 1),
+            'cache_hits': stats.cache_hits[endpoint],
+            'statuses': dict(stats.statuses[endpoint]),
+        }
+    return {
+        'duration_s': round(elapsed, 1),
+        'requests': total,
+        'rps': round(total / elapsed, 1),
+        'errors': dict(stats.errors),
+        'crawls': crawls,
+        'feed_requests': feed_hits,
+        'feeds': feeds_total,
+        'endpoints': endpoints,
+    }
+
+
+def print_report(report):
+    print(f"\n{report['requests']} requests in {report['duration_s']}s ({report['rps']} req/s)")
+    if report['feed_requests'] is None:
+        print(f"Crawls: {report['crawls']}")
+    else:
+        print(f"Crawls: {report['crawls']}  Feed requests: {report['feed_requests']} ({report['feeds']} feeds)")
+    print(f"\n{'endpoint':<18}{'reqs':>7}{'rps':>8}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}{'hits':>7}  statuses")
+    for endpoint, row in report['endpoints'].items():
+        statuses = ' '.join(f"{code}x{count}" for code, count in sorted(row['statuses'].items()))
+        print(f"{endpoint:<18}{row['requests']:>7}{row['rps']:>8}{row['p50_ms']:>9}{row['p90_ms']:>9}"
+              f"{row['p99_ms']:>9}{row['max_ms']:>9}{row['cache_hits']:>7}  {statuses}")
+    for error, count in report['errors'].items():
+        print(f"ERROR {error}: {count}")
+
+
+def check_thresholds(report, args):
+    """Return a list of threshold violations"""
+    failures = []
+    if args.max_p99_ms is not None:
+        for endpoint, row in report['endpoints'].items():
+            if row['p99_ms'] > args.max_p99_ms:
+                failures.append(f"{endpoint} p99 {row['p99_ms']} ms > {args.max_p99_ms} ms")
+    if args.max_crawls is not None and report['crawls'] > args.max_crawls:
+        failures.append(f"{report['crawls']} crawls > {args.max_crawls}")
+    if report['errors']:
+        failures.append(f"{sum(report['errors'].values())} request errors")
+    return failures
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description='Load test the InTheLoop API against a stand-in feed server')
+    parser.add_argument('--target', metavar='URL', help='drive an already running app instead of starting one in-process')
+    parser.add_argument('--users', type=int, default=20, help='concurrent virtual users')
+    parser.add_argument('--duration', type=float, default=30, help='seconds of load after warm-up')
+    parser.add_argument('--think-time', type=float, default=1.0, help='max seconds a user pauses between scenarios')
+    parser.add_argument('--feeds-per-category', type=int, default=5)
+    parser.add_argument('--items', type=int, default=20, help='entries per stand-in feed')
+    parser.add_argument('--feed-latency', type=float, default=0.05, help='seconds the feed server waits per request')
+    parser.add_argument('--ttl', type=float, help='override CACHE_TTL in seconds to force expiry during the run (in-process only)')
+    parser.add_argument('--polite', action='store_true', help='keep the per-host fetch limits (in-process only)')
+    parser.add_argument('--no-rate-limit', action='store_true',
+                        help='disable refresh rate limits, since all users share one IP (in-process only)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    parser.add_argument('--max-p99-ms', type=float, help='fail if any endpoint p99 exceeds this')
+    parser.add_argument('--max-crawls', type=int, help='fail if the app crawls more often than this')
+    parser.add_argument('--verbose', action='store_true', help='show the app and request logs')
+    args = parser.parse_args()
+    if args.target and (args.ttl or args.polite or args.no_rate_limit):
+        parser.error('--ttl, --polite and --no-rate-limit only apply to the in-process app')
+
+    # main.py logs every cache hit at INFO, which would swamp the report
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+
+    categories = list(main.rss_feeds)
+    if args.target:
+        # The external app fetches its own feeds, so there is nothing to count
+        base_url = args.target.rstrip('/')
+        feeds_total = None
+    else:
+        feed_base = start_feed_server(args.feed_latency, args.items)
+        base_url = start_app(feed_base, args.feeds_per_category, args)
+        feeds_total = args.feeds_per_category * len(categories)
+    crawls_before = requests.get(base_url + '/api/health', timeout=10).json().get('crawls') or 0
+
+    # Warm up with one crawl so the run measures steady state plus any expiry
+    started = time.perf_counter()
+    requests.get(base_url + '/api/articles', timeout=300)
+    if not args.json:
+        subject = f"request to {base_url}" if args.target else f"crawl of {feeds_total} feeds"
+        print(f"Warm-up {subject} took {time.perf_counter() - started:.2f}s")
+
+    stats = Stats()
+    deadline = time.monotonic() + args.duration
+    started = time.perf_counter()
+    users = [
+        threading.Thread(target=run_user, args=(base_url, categories, stats, deadline, args.think_time, args.seed + n))
+        for n in range(args.users)
+    ]
+    for user in users:
+        user.start()
+    for user in users:
+        user.join()
+    elapsed = time.perf_counter() - started
+
+    # Crawls during warm-up and the run; an external app may have crawled before
+    crawls = (requests.get(base_url + '/api/health', timeout=10).json().get('crawls') or 0) - crawls_before
+    feed_hits = None if args.target else FeedHandler.hits
+    report = build_report(stats, elapsed, feed_hits, feeds_total, crawls)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+    failures = check_thresholds(report, args)
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main_cli())
@@ -1,17 +1,36 @@
 import os
 import time
+
+# Startup timing, reported in the log and by /api/health. The clock starts
+# here, when main.py begins importing, not at interpreter start
+_import_started = time.perf_counter()
+
 import logging
-import feedparser
-import schedule
-from datetime import datetime, timedelta
-from flask import Flask, render_template, jsonify, request
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+from datetime import datetime, timedelta, timezone
+from flask import Flask, render_template, jsonify, request, Response
 from dotenv import load_dotenv
-import smtplib
 import threading
-from collections import defaultdict, Counter
+from collections import defaultdict, Counter, deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from urllib.parse import urlparse, urlsplit, urlunsplit, parse_qsl, urlencode
+import xml.etree.ElementTree as ET
+import json
+import tempfile
 import re
+import calendar
+from contextlib import contextmanager
+import hashlib
+import html
+from functools import lru_cache, wraps
+from html.parser import HTMLParser
+
+try:
+    import fcntl
+except ImportError:  # Windows: settings updates fall back to unlocked
+    fcntl = None
+
+# feedparser, requests, schedule, smtplib and the email modules are imported
+# where they are used so that starting a web worker doesn't pay for them
 
 load_dotenv()
 
@@ -144,9 +163,40 @@ rss_feeds = {
 # Global cache for articles
 articles_cache = []
 cache_timestamp = None
+cache_version = 0             # changes whenever articles_cache is replaced
+crawl_count = 0               # full crawls run by this process
+CACHE_TTL = timedelta(minutes=30)
+
+# Deployment mode:
+#   standalone - one process serves requests, crawls on demand and sends the digest
+#   refresher  - a single background process that owns crawling, trending and the
+#                digest, publishing each result as an immutable snapshot file
+#   web        - request workers (e.g. gunicorn -w 4 main:app) that only read the
+#                latest snapshot and never crawl or schedule anything themselves
+RUN_MODE = os.getenv('INTHELOOP_MODE', 'standalone')
+SNAPSHOT_PATH = os.getenv('INTHELOOP_SNAPSHOT', 'articles_snapshot.json')
+REFRESH_REQUEST_PATH = SNAPSHOT_PATH + '.refresh'
+REFRESHER_POLL_INTERVAL = 1   # seconds between refresher checks for work
+
+# Warm start: 'snapshot' persists every crawl and, on startup, serves the last
+# one immediately while re-crawling in the background if it is stale or
+# missing; 'off' leaves the first request to pay for a full crawl
+WARM_START = os.getenv('INTHELOOP_WARM_START', 'snapshot')
+
+# Milliseconds from main.py starting to import to the import finishing and to the
+# article cache first holding articles
+startup_timing = {'import_ms': None, 'warm_ms': None}
 
 # User's hidden feeds (persisted)
 hidden_feeds = set()
+HIDDEN_FEEDS_PATH = 'hidden_feeds.txt'
+
+# Changes whenever hidden or user-added feeds are loaded or saved
+feeds_version = 0
+
+# User-added feeds (persisted to favorites.json)
+favorite_feeds = []
+FAVORITES_PATH = 'favorites.json'
 
 # Available feeds that users can add
 available_feeds = {
@@ -199,97 +249,856 @@ available_feeds = {
 
 def load_hidden_feeds():
     """Load hidden feeds from file"""
-    global hidden_feeds
+    global hidden_feeds, feeds_version
+    feeds_version += 1
     try:
-        if os.path.exists('hidden_feeds.txt'):
-            with open('hidden_feeds.txt', 'r') as f:
+        if os.path.exists(HIDDEN_FEEDS_PATH):
+            with open(HIDDEN_FEEDS_PATH, 'r') as f:
                 hidden_feeds = set(line.strip() for line in f if line.strip())
     except Exception as e:
         logging.error(f"Error loading hidden feeds: {e}")
 
 def save_hidden_feeds():
-    """Save hidden feeds to file"""
+    """Save hidden feeds to file; use update_hidden_feeds to change them"""
+    global feeds_version
+    feeds_version += 1
     try:
-        with open('hidden_feeds.txt', 'w') as f:
-            for feed in hidden_feeds:
-                f.write(f"{feed}\n")
+        write_file_atomic(HIDDEN_FEEDS_PATH, ''.join(f"{feed}\n" for feed in hidden_feeds))
     except Exception as e:
         logging.error(f"Error saving hidden feeds: {e}")
 
+def update_hidden_feeds(hide=(), unhide=()):
+    """
+    Hide and/or unhide feeds, merging with changes other processes have saved.
+    
+    Returns True if the set of hidden feeds changed.
+    """
+    with settings_lock(HIDDEN_FEEDS_PATH):
+        load_hidden_feeds()
+        before = set(hidden_feeds)
+        hidden_feeds.update(hide)
+        hidden_feeds.difference_update(unhide)
+        changed = hidden_feeds != before
+        if changed:
+            save_hidden_feeds()
+    return changed
+
+def load_favorite_feeds():
+    """Load user-added feeds from file and merge them into rss_feeds"""
+    global favorite_feeds, feeds_version
+    feeds_version += 1
+    try:
+        if os.path.exists(FAVORITES_PATH):
+            with open(FAVORITES_PATH, 'r') as f:
+                favorite_feeds = json.load(f)
+    except Exception as e:
+        logging.error(f"Error loading favorite feeds: {e}")
+        return
+
+    for feed in favorite_feeds:
+        category = feed.get('category')
+        url = feed.get('url')
+        if category in rss_feeds and url and url not in rss_feeds[category]:
+            rss_feeds[category].append(url)
+
+def save_favorite_feeds():
+    """Save user-added feeds to file; use add_favorite_feeds to change them"""
+    global feeds_version
+    feeds_version += 1
+    try:
+        write_file_atomic(FAVORITES_PATH, json.dumps(favorite_feeds, indent=2))
+    except Exception as e:
+        logging.error(f"Error saving favorite feeds: {e}")
+
+def add_favorite_feeds(feeds):
+    """
+    Activate user-added feeds and save them, merging with feeds other
+    processes have added.
+    
+    Args:
+        feeds: List of (url, category, name) tuples; name may be None
+    """
+    with settings_lock(FAVORITES_PATH):
+        load_favorite_feeds()
+        saved_urls = {feed.get('url') for feed in favorite_feeds}
+        for url, category, name in feeds:
+            if url not in rss_feeds[category]:
+                rss_feeds[category].append(url)
+            if url not in saved_urls:
+                favorite_feeds.append({
+                    'url': url,
+                    'name': name or url,
+                    'category': category,
+                    'added_at': datetime.now().isoformat()
+                })
+                saved_urls.add(url)
+        save_favorite_feeds()
+
+@contextmanager
+def settings_lock(path):
+    """
+    Exclusive lock for a read-modify-write of a settings file, held across
+    every process (e.g. web workers) sharing the working directory
+    """
+    with open(path + '.lock', 'a') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+def write_file_atomic(path, text):
+    """Replace path with text so readers never see a partially written file"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'.{os.path.basename(path)}-')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+# ==================== HTTP Fetch Layer ====================
+
+# Feeds are fetched in parallel through one pooled session. Several feeds share
+# a host (rss.cnn.com, the Yahoo domains, feeds.*), so each host gets its own
+# concurrency cap and a minimum spacing between requests to avoid throttling.
+FETCH_TIMEOUT = 10            # seconds per feed request
+FETCH_WORKERS = 16            # feeds fetched at once across all hosts
+PER_HOST_CONCURRENCY = 2      # simultaneous requests to a single host
+PER_HOST_MIN_INTERVAL = 0.5   # seconds between request starts to a single host
+
+_http_session = None
+_session_lock = threading.Lock()
+_host_lock = threading.Lock()
+_host_semaphores = {}
+_host_next_start = {}
+
+def get_http_session():
+    """Return the shared keep-alive session used for all feed requests"""
+    global _http_session
+    with _session_lock:
+        if _http_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.request import ACCEPT_ENCODING
+            
+            session = requests.Session()
+            # One connection pool per host, each holding up to
+            # PER_HOST_CONCURRENCY keep-alive connections
+            adapter = HTTPAdapter(pool_connections=100, pool_maxsize=PER_HOST_CONCURRENCY)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers.update({
+                'User-Agent': 'InTheLoop/1.0 (+https://github.com/leifheaney5/InTheLoop)',
+                'Accept': 'application/rss+xml, application/atom+xml, application/xml;q=0.9, text/xml;q=0.9, */*;q=0.8',
+                # gzip/deflate always, br/zstd when the decoders are installed
+                'Accept-Encoding': ACCEPT_ENCODING,
+            })
+            _http_session = session
+        return _http_session
+
+def _acquire_host_slot(host):
+    """Block until a request to host is allowed; returns the semaphore to release"""
+    with _host_lock:
+        semaphore = _host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(PER_HOST_CONCURRENCY)
+            _host_semaphores[host] = semaphore
+    semaphore.acquire()
+    
+    # Reserve the next start time for this host so requests are spaced out
+    with _host_lock:
+        now = time.monotonic()
+        start = max(now, _host_next_start.get(host, now))
+        _host_next_start[host] = start + PER_HOST_MIN_INTERVAL
+    if start > now:
+        time.sleep(start - now)
+    return semaphore
+
+def http_get(url, timeout=FETCH_TIMEOUT, on_start=None):
+    """
+    GET url within the per-host limits, raising requests.RequestException on failure.
+    
+    on_start, if given, is called once the host slot is acquired, right
+    before the request is sent.
+    """
+    host = urlparse(url).netloc or url
+    semaphore = _acquire_host_slot(host)
+    try:
+        if on_start:
+            on_start()
+        response = get_http_session().get(url, timeout=timeout)
+        response.raise_for_status()
+    finally:
+        semaphore.release()
+    return response
+
+def download_feed(url, timeout=FETCH_TIMEOUT, on_start=None):
+    """Download and parse a single feed, raising requests.RequestException on failure"""
+    import feedparser
+    
+    response = http_get(url, timeout=timeout, on_start=on_start)
+    
+    # Pass the headers through so feedparser can detect the charset and
+    # resolve relative links against the final URL
+    headers = {k.lower(): v for k, v in response.headers.items()}
+    headers['content-location'] = response.url
+    return feedparser.parse(response.content, response_headers=headers)
+
+def fetch_feed(url):
+    """Download and parse a single feed; returns None if the request fails"""
+    import requests
+    
+    try:
+        return download_feed(url)
+    except requests.RequestException as e:
+        logging.warning(f"Request failed for {url}: {e}")
+        return None
+
+# ==================== Feed Validation & OPML ====================
+
+VALIDATE_TIMEOUT = 8          # seconds per candidate feed request
+VALIDATE_DEADLINE = 30        # seconds for a whole import batch
+VALIDATE_WORKERS = 32         # candidate feeds validated at once
+MAX_IMPORT_FEEDS = 500        # outlines accepted from a single OPML file
+
+def validate_feed(url, started_at=None):
+    """
+    Fetch a candidate feed once and report whether it is usable.
+
+    Returns a dictionary with url, status ('ok', 'bozo', 'timeout' or 'error'),
+    latency_ms, entries (entry count) and error (message or None). Latency is
+    measured from when the request is sent, not from time spent queued behind
+    other requests to the same host. If started_at is given, the start time
+    is also recorded there under url.
+    """
+    import requests
+    
+    if started_at is None:
+        started_at = {}
+    
+    def mark_started():
+        started_at[url] = time.monotonic()
+    
+    result = {'url': url, 'status': 'ok', 'latency_ms': None, 'entries': 0, 'error': None}
+    try:
+        feed = download_feed(url, timeout=VALIDATE_TIMEOUT, on_start=mark_started)
+        result['entries'] = len(feed.entries)
+        if feed.bozo:
+            result['status'] = 'bozo'
+            result['error'] = str(feed.get('bozo_exception', 'Malformed feed'))
+        elif not feed.entries:
+            result['status'] = 'error'
+            result['error'] = 'Feed has no entries'
+    except requests.Timeout:
+        result['status'] = 'timeout'
+        result['error'] = f'No response within {VALIDATE_TIMEOUT}s'
+    except requests.RequestException as e:
+        result['status'] = 'error'
+        result['error'] = str(e)
+    if url in started_at:
+        result['latency_ms'] = int((time.monotonic() - started_at[url]) * 1000)
+    return result
+
+def validate_feeds(urls):
+    """Validate many candidate feeds concurrently within VALIDATE_DEADLINE"""
+    results = {}
+    started_at = {}
+    executor = ThreadPoolExecutor(max_workers=VALIDATE_WORKERS)
+    futures = {executor.submit(validate_feed, url, started_at): url for url in urls}
+    try:
+        for future in as_completed(futures, timeout=VALIDATE_DEADLINE):
+            results[futures[future]] = future.result()
+    except FuturesTimeoutError:
+        logging.warning(f"Feed validation deadline reached with {len(urls) - len(results)} feeds pending")
+    finally:
+        # Cancel queued work by hand; shutdown(cancel_futures=True) needs Python 3.9
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+    # Feeds unfinished at the deadline either had a request in flight
+    # (timeout) or were still queued behind their host and never checked
+    now = time.monotonic()
+    for url in urls:
+        if url in results:
+            continue
+        if url in started_at:
+            results[url] = {
+                'url': url,
+                'status': 'timeout',
+                'latency_ms': int((now - started_at[url]) * 1000),
+                'entries': 0,
+                'error': f'Validation deadline of {VALIDATE_DEADLINE}s reached'
+            }
+        else:
+            results[url] = {
+                'url': url,
+                'status': 'not_checked',
+                'latency_ms': None,
+                'entries': 0,
+                'error': f'Not requested before the {VALIDATE_DEADLINE}s deadline; try importing it again'
+            }
+    return [results[url] for url in urls]
+
+def parse_opml(data, default_category=None):
+    """
+    Extract (url, name, category) tuples from an OPML document.
+
+    The category comes from the outline's own category attribute when it
+    names one of our categories (in OPML 2.0 it is usually a taxonomy path
+    such as /Tech/News), otherwise from the title of its enclosing outline,
+    falling back to default_category.
+    """
+    root = ET.fromstring(data)
+    body = root.find('body')
+    if body is None:
+        raise ValueError('OPML document has no body')
+
+    found = []
+
+    def walk(node, parent_category):
+        for outline in node.findall('outline'):
+            label = outline.get('title') or outline.get('text')
+            url = outline.get('xmlUrl')
+            if url:
+                category = outline.get('category')
+                if category not in rss_feeds:
+                    category = parent_category or default_category
+                found.append((url.strip(), label or url.strip(), category))
+            else:
+                walk(outline, label if label in rss_feeds else parent_category)
+
+    walk(body, None)
+    return found
+
+def build_opml():
+    """Render the active (non-hidden) feeds as an OPML document"""
+    root = ET.Element('opml', version='2.0')
+    head = ET.SubElement(root, 'head')
+    ET.SubElement(head, 'title').text = 'InTheLoop Feeds'
+    ET.SubElement(head, 'dateCreated').text = datetime.now().strftime('%a, %d %b %Y %H:%M:%S')
+    body = ET.SubElement(root, 'body')
+
+    names = {feed['url']: feed.get('name') for feed in favorite_feeds}
+    for category, urls in rss_feeds.items():
+        group = ET.SubElement(body, 'outline', text=category, title=category)
+        for url in urls:
+            if url in hidden_feeds:
+                continue
+            name = names.get(url) or urlparse(url).netloc or url
+            ET.SubElement(group, 'outline', type='rss', text=name, title=name, xmlUrl=url)
+
+    return ET.tostring(root, encoding='utf-8', xml_declaration=True)
+
 def fetch_articles(force_refresh=False):
     """Fetch articles from RSS feeds with caching"""
-    global articles_cache, cache_timestamp
+    # Web workers never crawl; they serve the refresher's latest snapshot
+    if RUN_MODE == 'web':
+        if force_refresh:
+            request_refresh()
+        read_snapshot()
+        return articles_cache
     
     # Return cached articles if less than 30 minutes old
     if not force_refresh and cache_timestamp and articles_cache:
         age = datetime.now() - cache_timestamp
-        if age < timedelta(minutes=30):
+        if age < CACHE_TTL:
             logging.info("Returning cached articles")
             return articles_cache
     
+    return crawl_or_join(force_refresh)[0]
+
+def crawl_or_join(force_refresh=False):
+    """
+    Run a full crawl, or join the one already in flight instead of starting another.
+    
+    Returns (articles, merged) where merged is True when another caller's
+    crawl was used.
+    """
+    global articles_cache, cache_timestamp, cache_version, crawl_count, _crawl_in_flight
+    
+    with _crawl_state_lock:
+        crawl = _crawl_in_flight
+        if crawl is None:
+            _crawl_in_flight = threading.Event()
+    
+    if crawl is not None:
+        # Serve stale articles rather than wait on a crawl that is already
+        # running, such as the background crawl started by warm_cache()
+        if not force_refresh and articles_cache:
+            logging.info("Crawl in progress, returning stale articles")
+        else:
+            crawl.wait()
+        return articles_cache, True
+    
+    try:
+        with _crawl_lock:
+            # Another crawl may have finished since the caller checked the TTL
+            if not force_refresh and cache_timestamp and articles_cache:
+                if datetime.now() - cache_timestamp < CACHE_TTL:
+                    return articles_cache, False
+            
+            articles = crawl_articles()
+            crawl_count += 1
+            
+            # Update cache
+            articles_cache = articles
+            cache_timestamp = datetime.now()
+            cache_version += 1
+            mark_warm()
+            persist_articles(articles)
+    finally:
+        with _crawl_state_lock:
+            crawl, _crawl_in_flight = _crawl_in_flight, None
+        crawl.set()
+    
+    return articles, False
+
+def persist_articles(articles):
+    """Save the article cache for the next warm start; call with _crawl_lock held so saves land in order"""
+    # The refresher publishes its own snapshots, with trending included
+    if WARM_START == 'snapshot' and RUN_MODE == 'standalone':
+        try:
+            publish_snapshot(articles, None)
+        except Exception as e:
+            logging.error(f"Error persisting articles: {e}")
+
+def crawl_articles(active=None):
+    """
+    Fetch feeds once and return the parsed articles, newest first.
+    
+    Args:
+        active: Optional list of (category, url) pairs to fetch; defaults to
+                every feed in rss_feeds that isn't hidden
+    """
     articles = []
-    domain_to_category = {}
     
-    # Build domain to category mapping
-    for category, urls in rss_feeds.items():
-        for url in urls:
-            domain = url.split('/')[2] if len(url.split('/')) > 2 else url
-            domain_to_category[domain] = category
+    # Collect active feeds, then fetch them in parallel
+    if active is None:
+        active = []
+        for category, urls in rss_feeds.items():
+            for url in urls:
+                # Skip hidden feeds
+                if url in hidden_feeds:
+                    logging.info(f"Skipping hidden feed: {url}")
+                    continue
+                active.append((category, url))
     
-    for category, urls in rss_feeds.items():
-        for url in urls:
-            # Skip hidden feeds
-            if url in hidden_feeds:
-                logging.info(f"Skipping hidden feed: {url}")
-                continue
+    logging.info(f"Fetching {len(active)} feeds")
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+        feeds = list(executor.map(fetch_feed, [url for _, url in active]))
+    
+    for (category, url), feed in zip(active, feeds):
+        if feed is None:
+            continue
+        if feed.bozo:
+            logging.warning(f"Bad feed, skipping: {url}")
+            continue
+        
+        for entry in feed.entries[:8]:  # Increased from 5 to 8 per feed
+            try:
+                domain = url.split('/')[2] if len(url.split('/')) > 2 else url
+                summary_text, summary_html, summary_full = process_summary(getattr(entry, 'summary', 'No summary available'))
                 
-            logging.info(f"Fetching: {url}")
-            feed = feedparser.parse(url)
-            if feed.bozo:
-                logging.warning(f"Bad feed, skipping: {url}")
-                continue
-            
-            for entry in feed.entries[:8]:  # Increased from 5 to 8 per feed
-                try:
-                    # Get publication date
-                    pub_date = datetime.now()
-                    try:
-                        if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                            time_tuple = entry.published_parsed
-                            pub_date = datetime(int(time_tuple[0]), int(time_tuple[1]), int(time_tuple[2]), 
-                                              int(time_tuple[3]), int(time_tuple[4]), int(time_tuple[5]))
-                        elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                            time_tuple = entry.updated_parsed
-                            pub_date = datetime(int(time_tuple[0]), int(time_tuple[1]), int(time_tuple[2]),
-                                              int(time_tuple[3]), int(time_tuple[4]), int(time_tuple[5]))
-                    except (ValueError, TypeError, IndexError):
-                        # If date parsing fails, use current time
-                        pass
-                    
-                    domain = url.split('/')[2] if len(url.split('/')) > 2 else url
-                    
-                    articles.append({
-                        'title': entry.title,
-                        'author': getattr(entry, 'author', 'N/A'),
-                        'link': entry.link,
-                        'summary': getattr(entry, 'summary', 'No summary available'),
-                        'category': category,
-                        'site': domain,
-                        'feed_url': url,
-                        'published': pub_date.isoformat(),
-                        'published_display': pub_date.strftime('%b %d, %Y %I:%M %p')
-                    })
-                except AttributeError as e:
-                    logging.warning(f"Missing attribute in entry from {url}: {e}. Skipping entry.")
-                except Exception as e:
-                    logging.error(f"Error processing entry from {url}: {e}")
-    
-    # Update cache
-    articles_cache = articles
-    cache_timestamp = datetime.now()
+                articles.append({
+                    'title': entry.title,
+                    'author': getattr(entry, 'author', 'N/A'),
+                    'link': entry.link,
+                    'summary': summary_text,
+                    'summary_html': summary_html,
+                    'summary_full': summary_full,
+                    'category': category,
+                    'site': domain,
+                    'feed_url': url,
+                    'published_ts': entry_timestamp(entry)
+                })
+            except AttributeError as e:
+                logging.warning(f"Missing attribute in entry from {url}: {e}. Skipping entry.")
+            except Exception as e:
+                logging.error(f"Error processing entry from {url}: {e}")
     
+    # Optionally pull in the article body for trending and search
+    if FULLTEXT_ENABLED:
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+            texts = executor.map(get_article_text, [a['link'] for a in articles])
+            for article, text in zip(articles, texts):
+                article['body_text'] = text
+        prune_content_cache()
+    
+    # Keep the cache newest-first so time windows are a binary search
+    articles.sort(key=lambda a: a['published_ts'], reverse=True)
     return articles
 
+# ==================== Article Dates ====================
+
+# published_ts is a UTC epoch in seconds; 0 means the entry had no usable date,
+# which sorts undated items last and keeps them out of every time window
+UNDATED = 0
+
+def entry_timestamp(entry):
+    """UTC epoch seconds for a feed entry, or UNDATED"""
+    # feedparser normalizes *_parsed to UTC struct_time, so timegm is exact
+    time_tuple = entry.get('published_parsed') or entry.get('updated_parsed')
+    if not time_tuple:
+        return UNDATED
+    try:
+        return calendar.timegm(time_tuple)
+    except (ValueError, TypeError, OverflowError):
+        return UNDATED
+
+def articles_since(articles, cutoff_ts):
+    """Articles published at or after cutoff_ts, from a newest-first list"""
+    lo, hi = 0, len(articles)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if articles[mid]['published_ts'] >= cutoff_ts:
+            lo = mid + 1
+        else:
+            hi = mid
+    return articles[:lo]
+
+def format_published(ts):
+    """Human-readable local publication time for emails"""
+    if ts == UNDATED:
+        return ''
+    return datetime.fromtimestamp(ts).strftime('%b %d, %Y %I:%M %p')
+
+def serialize_article(article):
+    """Article dictionary for JSON responses, with an ISO 8601 UTC published time"""
+    ts = article['published_ts']
+    # Neither the article body nor the summary HTML is rendered by the frontend
+    serialized = {k: v for k, v in article.items() if k not in ('body_text', 'summary_html')}
+    serialized['published'] = datetime.fromtimestamp(ts, timezone.utc).isoformat() if ts != UNDATED else None
+    return serialized
+
+# ==================== Content Pipeline ====================
+
+# Summaries are cleaned once at ingest into a clipped plain-text 'summary', an
+# allowlisted 'summary_html' and the unclipped 'summary_full' that trending and
+# search match against. With INTHELOOP_FULLTEXT=1 the linked page is
+# also fetched once per canonical link and its paragraph text kept as
+# 'body_text', cached in memory (LRU) and on disk across restarts. The disk
+# cache is pruned after each crawl by age and file count.
+SUMMARY_MAX_CHARS = 200
+SUMMARY_CACHE_SIZE = 4096     # processed summaries kept in memory
+FULLTEXT_ENABLED = os.getenv('INTHELOOP_FULLTEXT') == '1'
+FULLTEXT_CACHE_DIR = os.getenv('INTHELOOP_CONTENT_CACHE', 'content_cache')
+FULLTEXT_CACHE_SIZE = 2048    # article bodies kept in memory
+FULLTEXT_DISK_MAX_AGE = timedelta(days=7)   # feeds rarely carry older links
+FULLTEXT_DISK_MAX_FILES = 20000
+FULLTEXT_MAX_CHARS = 5000
+FULLTEXT_TIMEOUT = 10         # seconds per article page request
+
+ALLOWED_TAGS = {'p', 'br', 'b', 'strong', 'i', 'em', 'a', 'ul', 'ol', 'li', 'blockquote'}
+VOID_TAGS = {'br'}
+BLOCK_TAGS = {'p', 'br', 'div', 'li', 'ul', 'ol', 'blockquote', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'tr'}
+DROP_CONTENT_TAGS = {'script', 'style', 'noscript', 'iframe', 'object', 'svg', 'template'}
+ARTICLE_SKIP_TAGS = DROP_CONTENT_TAGS | {'nav', 'header', 'footer', 'aside', 'form', 'figure'}
+TRACKING_PARAMS = {'fbclid', 'gclid', 'mc_cid', 'mc_eid', 'cmpid', 'ocid', 'ref', 'src'}
+
+_fulltext_cache = OrderedDict()
+_fulltext_lock = threading.Lock()
+
+class SummaryParser(HTMLParser):
+    """Splits feed HTML into plain text and allowlisted HTML, clipped to max_chars of text,
+    plus the unclipped plain text for trending and search"""
+    
+    def __init__(self, max_chars):
+        super().__init__(convert_charrefs=True)
+        self.budget = max_chars - 3  # room for the ellipsis
+        self.text = []
+        self.html = []
+        self.full_text = []
+        self.length = 0
+        self.open_tags = []
+        self.skip_depth = 0
+        self.clipped = False
+    
+    def _space(self):
+        if self.full_text and not self.full_text[-1].endswith(' '):
+            self.full_text.append(' ')
+        if self.clipped or self.length >= self.budget:
+            return
+        if self.text and not self.text[-1].endswith(' '):
+            self.text.append(' ')
+            self.html.append(' ')
+            self.length += 1
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in DROP_CONTENT_TAGS:
+            self.skip_depth += 1
+            return
+        if self.skip_depth:
+            return
+        if tag in BLOCK_TAGS:
+            self._space()
+        if self.clipped or tag not in ALLOWED_TAGS:
+            return
+        
+        if tag == 'a':
+            href = dict(attrs).get('href') or ''
+            if urlparse(href).scheme not in ('http', 'https'):
+                return
+            self.html.append(f'<a href="{html.escape(href)}" rel="noopener noreferrer" target="_blank">')
+        else:
+            self.html.append(f'<{tag}>')
+        if tag not in VOID_TAGS:
+            self.open_tags.append(tag)
+    
+    def handle_endtag(self, tag):
+        if tag in DROP_CONTENT_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+            return
+        if self.skip_depth:
+            return
+        if tag in BLOCK_TAGS:
+            self._space()
+        if self.clipped:
+            return
+        if tag in self.open_tags:
+            while self.open_tags:
+                open_tag = self.open_tags.pop()
+                self.html.append(f'</{open_tag}>')
+                if open_tag == tag:
+                    break
+    
+    def handle_data(self, data):
+        if self.skip_depth:
+            return
+        data = re.sub(r'\s+', ' ', data)
+        if not self.full_text or self.full_text[-1].endswith(' '):
+            self.full_text.append(data.lstrip())
+        else:
+            self.full_text.append(data)
+        if self.clipped:
+            return
+        if not self.text or self.text[-1].endswith(' '):
+            data = data.lstrip()
+        if not data:
+            return
+        
+        remaining = max(0, self.budget - self.length)
+        if len(data) > remaining:
+            data = data[:remaining]
+            # Prefer to cut at a word boundary
+            if ' ' in data:
+                data = data.rsplit(' ', 1)[0]
+            data = data.rstrip()
+            if not data and self.text and self.text[-1] == ' ':
+                # Budget ran out right after a block break
+                self.text.pop()
+                self.length -= 1
+                if self.html[-1] == ' ':
+                    self.html.pop()
+            data += '...'
+            self.clipped = True
+        
+        self.text.append(data)
+        self.html.append(html.escape(data, quote=False))
+        self.length += len(data)
+    
+    def result(self):
+        self.close()
+        closing = ''.join(f'</{tag}>' for tag in reversed(self.open_tags))
+        return (''.join(self.text).strip(), (''.join(self.html) + closing).strip(),
+                ''.join(self.full_text).strip())
+
+class ArticleTextParser(HTMLParser):
+    """Collects paragraph text from an article page, skipping navigation and scripts"""
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.paragraphs = []
+        self.current = None
+        self.skip_depth = 0
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in ARTICLE_SKIP_TAGS:
+            self.skip_depth += 1
+        elif tag == 'p' and not self.skip_depth:
+            self.current = []
+    
+    def handle_endtag(self, tag):
+        if tag in ARTICLE_SKIP_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif tag == 'p' and self.current is not None:
+            paragraph = re.sub(r'\s+', ' ', ''.join(self.current)).strip()
+            if paragraph:
+                self.paragraphs.append(paragraph)
+            self.current = None
+    
+    def handle_data(self, data):
+        if self.current is not None and not self.skip_depth:
+            self.current.append(data)
+
+@lru_cache(maxsize=SUMMARY_CACHE_SIZE)
+def process_summary(raw):
+    """Return (clipped text, safe HTML, full text) for a feed summary; unchanged summaries hit the cache"""
+    parser = SummaryParser(SUMMARY_MAX_CHARS)
+    try:
+        parser.feed(raw or '')
+        return parser.result()
+    except Exception as e:
+        logging.warning(f"Error sanitizing summary: {e}")
+        return '', '', ''
+
+def canonical_link(link):
+    """Normalize an article link so tracking parameters and fragments don't split the cache"""
+    parts = urlsplit(link.strip())
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if not k.lower().startswith('utm_') and k.lower() not in TRACKING_PARAMS]
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', urlencode(query), ''))
+
+def extract_article_text(link):
+    """Fetch an article page and return its paragraph text, clipped to FULLTEXT_MAX_CHARS"""
+    response = http_get(link, timeout=FULLTEXT_TIMEOUT)
+    if 'html' not in response.headers.get('content-type', ''):
+        return ''
+    parser = ArticleTextParser()
+    parser.feed(response.text)
+    parser.close()
+    return ' '.join(parser.paragraphs)[:FULLTEXT_MAX_CHARS]
+
+def get_article_text(link):
+    """Body text for an article link, fetched at most once per canonical link"""
+    import requests
+    
+    key = canonical_link(link)
+    with _fulltext_lock:
+        if key in _fulltext_cache:
+            _fulltext_cache.move_to_end(key)
+            return _fulltext_cache[key]
+    
+    path = os.path.join(FULLTEXT_CACHE_DIR, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.txt')
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+    except FileNotFoundError:
+        try:
+            text = extract_article_text(link)
+        except (requests.RequestException, ValueError) as e:
+            # Don't persist failures; the page may be reachable next crawl
+            logging.warning(f"Could not extract article text from {link}: {e}")
+            return ''
+        try:
+            os.makedirs(FULLTEXT_CACHE_DIR, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=FULLTEXT_CACHE_DIR, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.error(f"Error caching article text: {e}")
+    
+    with _fulltext_lock:
+        _fulltext_cache[key] = text
+        _fulltext_cache.move_to_end(key)
+        while len(_fulltext_cache) > FULLTEXT_CACHE_SIZE:
+            _fulltext_cache.popitem(last=False)
+    return text
+
+def prune_content_cache():
+    """Delete cached article bodies older than FULLTEXT_DISK_MAX_AGE, then the oldest beyond FULLTEXT_DISK_MAX_FILES"""
+    try:
+        entries = [(e.stat().st_mtime, e.path) for e in os.scandir(FULLTEXT_CACHE_DIR) if e.is_file()]
+    except FileNotFoundError:
+        return 0
+    
+    entries.sort(reverse=True)
+    cutoff = time.time() - FULLTEXT_DISK_MAX_AGE.total_seconds()
+    stale = [path for n, (mtime, path) in enumerate(entries) if mtime < cutoff or n >= FULLTEXT_DISK_MAX_FILES]
+    for path in stale:
+        try:
+            os.remove(path)
+        except OSError as e:
+            logging.warning(f"Could not prune {path}: {e}")
+    if stale:
+        logging.info(f"Pruned {len(stale)} cached article bodies")
+    return len(stale)
+
+def mark_warm():
+    """Record how long after main.py started importing the cache first held articles"""
+    if startup_timing['warm_ms'] is None and articles_cache:
+        startup_timing['warm_ms'] = round((time.perf_counter() - _import_started) * 1000, 1)
+        logging.info(f"Article cache warm after {startup_timing['warm_ms']} ms")
+
+def warm_cache():
+    """Load the last persisted crawl and re-crawl in the background if it is stale"""
+    if WARM_START != 'snapshot':
+        return
+    
+    read_snapshot()
+    if articles_cache and cache_timestamp and datetime.now() - cache_timestamp < CACHE_TTL:
+        return
+    
+    logging.info("Starting background crawl to warm the article cache")
+    threading.Thread(target=fetch_articles, kwargs={'force_refresh': True}, daemon=True).start()
+
+def refresh_now():
+    """
+    Force a full crawl, joining one that is already in flight.
+    
+    Returns (articles, merged) where merged is True when no new crawl was
+    started because another request's crawl (or queued refresh) covered it.
+    """
+    if RUN_MODE == 'web':
+        merged = os.path.exists(REFRESH_REQUEST_PATH)
+        request_refresh()
+        read_snapshot()
+        return articles_cache, merged
+    
+    return crawl_or_join(force_refresh=True)
+
+def feed_category(feed_url):
+    """Category a configured feed belongs to, or None"""
+    for category, urls in rss_feeds.items():
+        if feed_url in urls:
+            return category
+    return None
+
+def drop_feed_articles(feed_url):
+    """Remove a feed's articles from the cache without re-crawling"""
+    global articles_cache, cache_version
+    if RUN_MODE == 'web':
+        request_refresh()
+        return
+    with _crawl_lock:
+        articles_cache = [a for a in articles_cache if a['feed_url'] != feed_url]
+        cache_version += 1
+        persist_articles(articles_cache)
+
+def refresh_feed(feed_url):
+    """Fetch a single feed and merge its articles into the cache"""
+    global articles_cache, cache_version
+    if RUN_MODE == 'web':
+        request_refresh()
+        return
+    
+    category = feed_category(feed_url)
+    # Nothing cached yet means the next request crawls every feed anyway
+    if category is None or not articles_cache:
+        return
+    
+    new_articles = crawl_articles([(category, feed_url)])
+    with _crawl_lock:
+        articles = [a for a in articles_cache if a['feed_url'] != feed_url] + new_articles
+        articles.sort(key=lambda a: a['published_ts'], reverse=True)
+        articles_cache = articles
+        cache_version += 1
+        persist_articles(articles)
+
+def invalidate_cache():
+    """Mark the article cache stale so the next request re-crawls"""
+    global cache_timestamp
+    if RUN_MODE == 'web':
+        request_refresh()
+        return
+    cache_timestamp = None
+
 def extract_trending_topics(articles, top_n=10):
     """
     Extract trending topics from articles using keyword frequency analysis.
@@ -310,7 +1119,7 @@ def extract_trending_topics(articles, top_n=10):
     6. Return top N topics with their mention counts and related articles
     
     Args:
-        articles: List of article dictionaries with 'title', 'summary', 'published', 'link'
+        articles: Newest-first list of article dictionaries with 'title', 'summary_full', 'published_ts', 'link'
         top_n: Number of top trending topics to return (default: 10)
     
     Returns:
@@ -321,16 +1130,7 @@ def extract_trending_topics(articles, top_n=10):
     """
     
     # Filter articles from last 24 hours
-    now = datetime.now()
-    recent_articles = []
-    for article in articles:
-        try:
-            pub_date = datetime.fromisoformat(article['published'])
-            if now - pub_date <= timedelta(hours=24):
-                recent_articles.append(article)
-        except (ValueError, KeyError):
-            # If date parsing fails, skip this article
-            continue
+    recent_articles = articles_since(articles, int(time.time()) - 24 * 60 * 60)
     
     if not recent_articles:
         return []
@@ -424,17 +1224,11 @@ def extract_trending_topics(articles, top_n=10):
     word_counter = Counter()
     
     for article in recent_articles:
-        # Combine title and summary for better context
-        text = f"{article['title']} {article['summary']}"
+        # Combine title, summary and body (if extracted) for better context;
+        # summaries are already plain text from process_summary
+        text = f"{article['title']} {article['summary_full']} {article.get('body_text', '')}"
         text = text.lower()
         
-        # Remove HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
-        
-        # Remove HTML entities
-        text = re.sub(r'&[a-z]+;', ' ', text)
-        text = re.sub(r'&#\d+;', ' ', text)
-        
         # Remove special characters but keep hyphens in words
         text = re.sub(r'[^\w\s-]', ' ', text)
         
@@ -541,7 +1335,7 @@ def extract_trending_topics(articles, top_n=10):
         topic_articles = []
         
         for article in recent_articles:
-            text = f"{article['title']} {article['summary']}".lower()
+            text = f"{article['title']} {article['summary_full']} {article.get('body_text', '')}".lower()
             if topic_lower in text:
                 topic_articles.append({
                     'title': article['title'],
@@ -559,9 +1353,6 @@ def extract_trending_topics(articles, top_n=10):
 
 def create_email_content(articles):
     """Create HTML email content from articles"""
-    import html
-    from collections import defaultdict
-    
     # Group articles by category
     grouped = defaultdict(list)
     for art in articles:
@@ -573,10 +1364,8 @@ def create_email_content(articles):
         for art in grouped[category]:
             # Escape HTML entities in title
             title = html.escape(art['title'])
-            # Strip HTML tags from summary but keep the text
-            import re
-            summary = re.sub('<[^<]+?>', '', art['summary'])
-            summary = html.unescape(summary)[:200] + '...' if len(summary) > 200 else html.unescape(summary)
+            # Summaries are plain text already clipped at ingest
+            summary = html.escape(art['summary'])
             
             article_html += f"""
             <div style="margin-bottom: 20px; padding: 15px; background: #f5f7fa; border-left: 3px solid #2563eb;">
@@ -585,7 +1374,7 @@ def create_email_content(articles):
                 </h3>
                 <p style="color: #4a5568; margin: 10px 0;">{summary}</p>
                 <p style="font-size: 12px; color: #a0aec0;">
-                    <strong>{art['site']}</strong> • {art['published_display']}
+                    <strong>{art['site']}</strong> • {format_published(art['published_ts'])}
                 </p>
             </div>
             """
@@ -612,6 +1401,10 @@ def create_email_content(articles):
     """
 
 def send_email(html_content):
+    import smtplib
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+    
     sender = os.getenv('SENDER_EMAIL')
     receiver = os.getenv('RECEIVER_EMAIL')
     pwd = os.getenv('APP_PASSWORD')
@@ -633,6 +1426,215 @@ def send_email(html_content):
     except Exception as e:
         logging.error(f"Email error: {e}")
 
+# ==================== Snapshots ====================
+
+# Bumped whenever the article fields change so stale files are ignored
+SNAPSHOT_FORMAT = 4
+
+_snapshot = None
+_snapshot_key = None
+_snapshot_lock = threading.Lock()
+_crawl_lock = threading.Lock()          # held while the article cache is rebuilt
+_crawl_state_lock = threading.Lock()    # guards _crawl_in_flight
+_crawl_in_flight = None                 # Event set when the running full crawl ends
+
+def publish_snapshot(articles, trending):
+    """Atomically replace the snapshot file read by web workers"""
+    snapshot = {
+        'format': SNAPSHOT_FORMAT,
+        'version': time.time_ns(),
+        'generated_at': datetime.now().isoformat(),
+        'crawls': crawl_count,
+        'articles': articles,
+        'trending': trending
+    }
+    
+    # Write to a temporary file in the same directory, then rename over the
+    # old snapshot so readers only ever see a complete file
+    directory = os.path.dirname(os.path.abspath(SNAPSHOT_PATH))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.snapshot-', suffix='.json')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, SNAPSHOT_PATH)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+    logging.info(f"Published snapshot {snapshot['version']} with {len(articles)} articles")
+    return snapshot['version']
+
+def read_snapshot():
+    """
+    Return the latest published snapshot, or None if there isn't one yet.
+    
+    The file is only parsed when the refresher has swapped in a new one, so
+    a request costs a single stat() while the snapshot is unchanged. Adopting
+    a new snapshot also reloads the feed settings other workers may have saved
+    and leaves out articles from feeds hidden since it was written.
+    """
+    global _snapshot, _snapshot_key, articles_cache, cache_timestamp, cache_version, crawl_count
+    try:
+        st = os.stat(SNAPSHOT_PATH)
+    except FileNotFoundError:
+        return _snapshot
+    
+    key = (st.st_ino, st.st_mtime_ns, st.st_size)
+    if key == _snapshot_key:
+        return _snapshot
+    
+    with _snapshot_lock:
+        if key != _snapshot_key:
+            try:
+                with open(SNAPSHOT_PATH, 'r', encoding='utf-8') as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError) as e:
+                logging.error(f"Error reading snapshot: {e}")
+                return _snapshot
+            
+            if snapshot.get('format') != SNAPSHOT_FORMAT:
+                logging.warning(f"Ignoring snapshot in an old format: {SNAPSHOT_PATH}")
+                _snapshot_key = key
+                return _snapshot
+            
+            _snapshot = snapshot
+            _snapshot_key = key
+            load_hidden_feeds()
+            load_favorite_feeds()
+            # Feeds hidden since the snapshot was written stay hidden
+            articles_cache = [a for a in snapshot['articles'] if a['feed_url'] not in hidden_feeds]
+            cache_timestamp = datetime.fromisoformat(snapshot['generated_at'])
+            cache_version = snapshot['version']
+            if RUN_MODE == 'web':
+                # Report the refresher's crawls from /api/health
+                crawl_count = snapshot.get('crawls', 0)
+            mark_warm()
+            logging.info(f"Loaded snapshot {snapshot['version']}")
+    return _snapshot
+
+def request_refresh():
+    """Ask the refresher process to crawl at its next poll"""
+    try:
+        with open(REFRESH_REQUEST_PATH, 'a'):
+            pass
+    except OSError as e:
+        logging.error(f"Error requesting refresh: {e}")
+
+def get_trending():
+    """Trending topics for the current articles"""
+    if RUN_MODE == 'web':
+        snapshot = read_snapshot()
+        return (snapshot and snapshot.get('trending')) or []
+    articles = fetch_articles()
+    logging.info(f"Found {len(articles)} articles for trending analysis")
+    return extract_trending_topics(articles, top_n=10)
+
+# ==================== Request Caching & Rate Limits ====================
+
+TRENDING_CACHE_TTL = 60       # seconds a /api/trending response is reused
+FEEDS_CACHE_TTL = 300         # seconds a /api/feeds response is reused
+
+# Routes that crawl or change the feed set, limited per client IP and
+# globally in separate buckets: (per client, all clients) requests per window.
+# Under several web workers each worker keeps its own counts.
+RATE_LIMIT_WINDOW = 60        # seconds
+RATE_LIMITS = {
+    'refresh': (5, 20),       # full crawls: /api/refresh and OPML import
+    'feed_edit': (30, 120),   # hide, unhide and add, which fetch one feed at most
+}
+# Web workers queue a full crawl in the refresher for every feed edit
+FEED_EDIT_BUCKET = 'refresh' if RUN_MODE == 'web' else 'feed_edit'
+MAX_TRACKED_CLIENTS = 10000
+
+_response_cache = {}
+_response_cache_lock = threading.Lock()
+_rate_lock = threading.Lock()
+_client_requests = defaultdict(deque)     # (bucket, client) -> request times
+_global_requests = defaultdict(deque)     # bucket -> request times
+
+def articles_version():
+    """Version of the articles being served, crawling first if the cache is stale"""
+    fetch_articles()
+    return cache_version
+
+def feed_settings_version():
+    """Version of the feed list, picking up changes from other web workers"""
+    if RUN_MODE == 'web':
+        read_snapshot()
+    return feeds_version
+
+def cached_response(ttl, version):
+    """
+    Reuse a JSON view's last response for up to ttl seconds while version()
+    is unchanged. Only the most recent response per view is kept.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = (request.full_path, version())
+            now = time.monotonic()
+            with _response_cache_lock:
+                entry = _response_cache.get(view.__name__)
+            if entry and entry[0] == key and entry[1] > now:
+                response = app.response_class(entry[2], mimetype='application/json')
+                response.headers['X-Cache'] = 'HIT'
+                return response
+            
+            response = view(*args, **kwargs)
+            if response.status_code == 200:
+                with _response_cache_lock:
+                    _response_cache[view.__name__] = (key, now + ttl, response.get_data())
+            response.headers['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
+
+def _window_retry_after(window, limit, now):
+    """Seconds until window has room for another request, or 0 if it has room now"""
+    while window and window[0] <= now - RATE_LIMIT_WINDOW:
+        window.popleft()
+    if len(window) < limit:
+        return 0
+    return window[len(window) - limit] + RATE_LIMIT_WINDOW - now
+
+def rate_limited(bucket):
+    """Reject requests over the bucket's per-client or global limit in RATE_LIMITS with 429"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            client = (bucket, request.remote_addr or 'unknown')
+            per_client, per_bucket = RATE_LIMITS[bucket]
+            now = time.monotonic()
+            with _rate_lock:
+                client_window = _client_requests[client]
+                global_window = _global_requests[bucket]
+                retry_after = max(
+                    _window_retry_after(client_window, per_client, now),
+                    _window_retry_after(global_window, per_bucket, now)
+                )
+                if retry_after:
+                    if not client_window:
+                        del _client_requests[client]
+                else:
+                    client_window.append(now)
+                    global_window.append(now)
+                
+                # Forget clients whose windows have emptied
+                if len(_client_requests) > MAX_TRACKED_CLIENTS:
+                    for idle in [c for c, w in _client_requests.items() if not w or w[-1] <= now - RATE_LIMIT_WINDOW]:
+                        del _client_requests[idle]
+            
+            if retry_after:
+                logging.warning(f"Rate limited {request.path} for {client[1]}")
+                return jsonify({
+                    'error': 'Too many requests, please try again shortly',
+                    'retry_after': int(retry_after) + 1
+                }), 429, {'Retry-After': str(int(retry_after) + 1)}
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
 # Flask Routes
 @app.route('/')
 def index():
@@ -649,9 +1651,14 @@ def get_articles_api():
     """API endpoint to fetch articles with filtering"""
     category = request.args.get('category', 'all')
     search = request.args.get('search', '').lower()
+    since = request.args.get('since', type=int)
     
     articles = fetch_articles()
     
+    # Filter by publication time (UTC epoch seconds)
+    if since:
+        articles = articles_since(articles, since)
+    
     # Filter by category
     if category != 'all':
         articles = [a for a in articles if a['category'] == category]
@@ -660,26 +1667,26 @@ def get_articles_api():
     if search:
         articles = [a for a in articles if 
                    search in a['title'].lower() or 
-                   search in a['summary'].lower()]
+                   search in a['summary_full'].lower() or
+                   search in a.get('body_text', '').lower()]
     
     # Calculate total active feeds
     total_feeds = sum(len(feeds) for feeds in rss_feeds.values())
     active_feeds = total_feeds - len(hidden_feeds)
     
     return jsonify({
-        'articles': articles,
+        'articles': [serialize_article(a) for a in articles],
         'count': len(articles),
         'cached': cache_timestamp.isoformat() if cache_timestamp else None,
         'feed_count': active_feeds
     })
 
 @app.route('/api/trending')
+@cached_response(TRENDING_CACHE_TTL, articles_version)
 def get_trending_topics():
     """API endpoint to get trending topics from last 24 hours"""
     logging.info("Trending topics API called")
-    articles = fetch_articles()
-    logging.info(f"Found {len(articles)} articles for trending analysis")
-    trending = extract_trending_topics(articles, top_n=10)
+    trending = get_trending()
     logging.info(f"Extracted {len(trending)} trending topics")
     
     return jsonify({
@@ -689,16 +1696,38 @@ def get_trending_topics():
     })
 
 @app.route('/api/refresh')
+@rate_limited('refresh')
 def refresh_articles():
     """Force refresh articles"""
-    articles = fetch_articles(force_refresh=True)
+    articles, merged = refresh_now()
     return jsonify({
         'success': True,
         'count': len(articles),
-        'timestamp': datetime.now().isoformat()
+        'timestamp': datetime.now().isoformat(),
+        # In web mode the crawl happens in the refresher, not in this request
+        'queued': RUN_MODE == 'web',
+        # True when this request joined a crawl or refresh already in flight
+        'merged': merged
+    })
+
+@app.route('/api/health')
+def health():
+    """Readiness probe reporting startup timing and cache state"""
+    if RUN_MODE == 'web':
+        read_snapshot()
+    return jsonify({
+        'status': 'ok',
+        'mode': RUN_MODE,
+        'warm': bool(articles_cache),
+        'count': len(articles_cache),
+        'cached': cache_timestamp.isoformat() if cache_timestamp else None,
+        'crawls': crawl_count,
+        'import_ms': startup_timing['import_ms'],
+        'warm_ms': startup_timing['warm_ms']
     })
 
 @app.route('/api/feeds')
+@cached_response(FEEDS_CACHE_TTL, feed_settings_version)
 def get_feeds():
     """Get all RSS feeds with their status"""
     feeds_list = []
@@ -719,6 +1748,7 @@ def get_feeds():
     })
 
 @app.route('/api/feeds/hide', methods=['POST'])
+@rate_limited(FEED_EDIT_BUCKET)
 def hide_feed():
     """Hide a specific feed"""
     data = request.json
@@ -727,11 +1757,10 @@ def hide_feed():
     if not feed_url:
         return jsonify({'error': 'URL required'}), 400
     
-    hidden_feeds.add(feed_url)
-    save_hidden_feeds()
+    update_hidden_feeds(hide=[feed_url])
     
-    # Force refresh articles
-    fetch_articles(force_refresh=True)
+    # Drop the feed's articles; no need to re-crawl the others
+    drop_feed_articles(feed_url)
     
     return jsonify({
         'success': True,
@@ -740,6 +1769,7 @@ def hide_feed():
     })
 
 @app.route('/api/feeds/unhide', methods=['POST'])
+@rate_limited(FEED_EDIT_BUCKET)
 def unhide_feed():
     """Unhide a specific feed"""
     data = request.json
@@ -748,12 +1778,9 @@ def unhide_feed():
     if not feed_url:
         return jsonify({'error': 'URL required'}), 400
     
-    if feed_url in hidden_feeds:
-        hidden_feeds.remove(feed_url)
-        save_hidden_feeds()
-        
-        # Force refresh articles
-        fetch_articles(force_refresh=True)
+    if update_hidden_feeds(unhide=[feed_url]):
+        # Fetch just this feed back into the cache
+        refresh_feed(feed_url)
     
     return jsonify({
         'success': True,
@@ -770,6 +1797,7 @@ def get_available_feeds():
     })
 
 @app.route('/api/feeds/add', methods=['POST'])
+@rate_limited(FEED_EDIT_BUCKET)
 def add_feed():
     """Add a new feed to the active feeds"""
     data = request.json
@@ -784,15 +1812,13 @@ def add_feed():
     
     # Add feed to the category if not already present
     if feed_url not in rss_feeds[category]:
-        rss_feeds[category].append(feed_url)
+        add_favorite_feeds([(feed_url, category, data.get('name'))])
         
         # Remove from hidden feeds if it was hidden
-        if feed_url in hidden_feeds:
-            hidden_feeds.remove(feed_url)
-            save_hidden_feeds()
+        update_hidden_feeds(unhide=[feed_url])
         
-        # Force refresh articles
-        fetch_articles(force_refresh=True)
+        # Fetch just the new feed into the cache
+        refresh_feed(feed_url)
         
         return jsonify({
             'success': True,
@@ -805,6 +1831,75 @@ def add_feed():
             'message': 'Feed already exists'
         }), 400
 
+@app.route('/api/feeds/import', methods=['POST'])
+@rate_limited('refresh')
+def import_feeds():
+    """Import feeds from an OPML file, validating them concurrently"""
+    upload = request.files.get('file')
+    data = upload.read() if upload else request.get_data()
+    default_category = request.args.get('category') or request.form.get('category')
+    
+    if not data:
+        return jsonify({'error': 'OPML file required'}), 400
+    if default_category and default_category not in rss_feeds:
+        return jsonify({'error': 'Invalid category'}), 400
+    
+    try:
+        outlines = parse_opml(data, default_category)
+    except (ET.ParseError, ValueError) as e:
+        return jsonify({'error': f'Invalid OPML: {e}'}), 400
+    
+    if len(outlines) > MAX_IMPORT_FEEDS:
+        return jsonify({'error': f'Too many feeds (limit {MAX_IMPORT_FEEDS})'}), 400
+    
+    # Sort out feeds that can't be added before spending any network time;
+    # results keep the file's order, with None until a feed is validated
+    active_urls = {url for urls in rss_feeds.values() for url in urls}
+    results = []
+    candidates = {}
+    for url, name, category in outlines:
+        if url in active_urls or url in candidates:
+            results.append({'url': url, 'status': 'skipped', 'error': 'Feed already exists'})
+        elif category not in rss_feeds:
+            results.append({'url': url, 'status': 'skipped', 'error': f'Invalid category: {category}'})
+        elif urlparse(url).scheme not in ('http', 'https'):
+            results.append({'url': url, 'status': 'skipped', 'error': 'Unsupported URL scheme'})
+        else:
+            candidates[url] = (name, category, len(results))
+            results.append(None)
+    
+    accepted = []
+    for result in validate_feeds(list(candidates)):
+        name, category, position = candidates[result['url']]
+        result['category'] = category
+        result['name'] = name
+        if result['status'] == 'ok':
+            accepted.append((result['url'], category, name))
+        results[position] = result
+    
+    added = len(accepted)
+    if accepted:
+        add_favorite_feeds(accepted)
+        update_hidden_feeds(unhide=[url for url, _, _ in accepted])
+        # Let the next request pick the new feeds up in a single crawl
+        invalidate_cache()
+    
+    return jsonify({
+        'success': True,
+        'added': added,
+        'total': len(results),
+        'results': results
+    })
+
+@app.route('/api/feeds/export')
+def export_feeds():
+    """Export the active feeds as an OPML file"""
+    return Response(
+        build_opml(),
+        mimetype='text/x-opml',
+        headers={'Content-Disposition': 'attachment; filename=intheloop-feeds.opml'}
+    )
+
 # ==================== Scheduled Job ====================
 
 def job():
@@ -819,22 +1914,83 @@ def job():
 
 def run_scheduler():
     """Run the scheduler in a background thread"""
+    import schedule
+    
     while True:
         schedule.run_pending()
         time.sleep(60)
 
-# Schedule email for 9am daily
-schedule.every().day.at("09:00").do(job)
+def schedule_digest():
+    """Schedule email for 9am daily"""
+    import schedule
+    
+    schedule.every().day.at("09:00").do(job)
+
+def run_refresher():
+    """
+    Refresher process main loop.
+    
+    Crawls whenever the snapshot is older than CACHE_TTL or a web worker has
+    requested a refresh, computes trending topics once per crawl and publishes
+    both as a snapshot. Also the only process that sends the daily digest.
+    """
+    import schedule
+    
+    schedule_digest()
+    last_crawl = None
+    while True:
+        requested = os.path.exists(REFRESH_REQUEST_PATH)
+        if requested or last_crawl is None or datetime.now() - last_crawl >= CACHE_TTL:
+            # Clear the request before crawling so one made mid-crawl isn't lost
+            if requested:
+                try:
+                    os.remove(REFRESH_REQUEST_PATH)
+                except FileNotFoundError:
+                    pass
+            
+            # Pick up hides and additions saved by the web workers
+            load_hidden_feeds()
+            load_favorite_feeds()
+            
+            last_crawl = datetime.now()
+            try:
+                articles = fetch_articles(force_refresh=True)
+                publish_snapshot(articles, extract_trending_topics(articles, top_n=10))
+            except Exception as e:
+                logging.error(f"Refresh failed: {e}")
+        
+        schedule.run_pending()
+        time.sleep(REFRESHER_POLL_INTERVAL)
+
+# Web workers are usually started by a WSGI server rather than __main__,
+# so load the persisted feed settings at import time
+if RUN_MODE == 'web':
+    load_hidden_feeds()
+    load_favorite_feeds()
+
+startup_timing['import_ms'] = round((time.perf_counter() - _import_started) * 1000, 1)
+logging.info(f"main imported in {startup_timing['import_ms']} ms")
 
 if __name__ == "__main__":
     # Load hidden feeds
     load_hidden_feeds()
     logging.info(f"Loaded {len(hidden_feeds)} hidden feeds")
+    load_favorite_feeds()
+    logging.info(f"Loaded {len(favorite_feeds)} user-added feeds")
     
-    # Start scheduler in background thread
-    scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
-    scheduler_thread.start()
+    if RUN_MODE == 'refresher':
+        logging.info(f"Starting refresher, publishing snapshots to {SNAPSHOT_PATH}")
+        run_refresher()
+    
+    # Start scheduler in background thread (the refresher owns it in web mode)
+    if RUN_MODE == 'standalone':
+        schedule_digest()
+        scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
+        scheduler_thread.start()
+        
+        # Serve the last crawl straight away instead of crawling on first request
+        warm_cache()
     
-    # Start Flask web server (articles will be fetched on first request)
+    # Start Flask web server
     logging.info("Starting web server at http://localhost:5000")
-    app.run(debug=True, host='0.0.0.0', port=5000, use_reloader=False)
+    app.run(debug=os.getenv('FLASK_DEBUG') == '1', host='0.0.0.0', port=5000, use_reloader=False)
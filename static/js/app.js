@@ -143,7 +143,7 @@ function applyFilters() {
         // Search filter
         const searchMatch = !currentSearch || 
             article.title.toLowerCase().includes(currentSearch) ||
-            article.summary.toLowerCase().includes(currentSearch);
+            (article.summary_full || article.summary).toLowerCase().includes(currentSearch);
         
         return categoryMatch && searchMatch;
     });
@@ -207,11 +207,8 @@ function createArticleCard(article, index) {
     // Format category for class name
     const categoryClass = article.category.replace(/\s+/g, '.');
     
-    // Strip HTML tags from summary and limit length
-    const cleanSummary = stripHtmlTags(article.summary);
-    const truncatedSummary = cleanSummary.length > 200 
-        ? cleanSummary.substring(0, 200) + '...' 
-        : cleanSummary;
+    // The server sends summaries as plain text, already clipped
+    const summary = article.summary || '';
     
     card.innerHTML = `
         <div class="article-header">
@@ -231,7 +228,7 @@ function createArticleCard(article, index) {
         </h3>
         
         <p class="article-summary">
-            ${escapeHtml(truncatedSummary)}
+            ${escapeHtml(summary)}
         </p>
         
         <div class="article-footer">
@@ -254,6 +251,8 @@ function createArticleCard(article, index) {
 
 // ==================== Utility Functions ====================
 function formatTimeAgo(dateString) {
+    if (!dateString) return '';
+    
     const date = new Date(dateString);
     const now = new Date();
     const diffMs = now - date;
@@ -279,12 +278,6 @@ function escapeHtml(text) {
     return div.innerHTML;
 }
 
-function stripHtmlTags(html) {
-    const div = document.createElement('div');
-    div.innerHTML = html;
-    return div.textContent || div.innerText || '';
-}
-
 function updateStats(data) {
     if (data.cached) {
         const cacheDate = new Date(data.cached);
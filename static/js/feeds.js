@@ -85,7 +85,7 @@ async function hideFeed(feedUrl) {
             showToast('Feed hidden successfully', 'success');
             await loadActiveFeeds();
         } else {
-            showToast('Failed to hide feed', 'error');
+            showToast(failureMessage(response, data, 'Failed to hide feed'), 'error');
         }
     } catch (error) {
         console.error('Error hiding feed:', error);
@@ -109,7 +109,7 @@ async function unhideFeed(feedUrl) {
             showToast('Feed restored successfully', 'success');
             await loadActiveFeeds();
         } else {
-            showToast('Failed to restore feed', 'error');
+            showToast(failureMessage(response, data, 'Failed to restore feed'), 'error');
         }
     } catch (error) {
         console.error('Error unhiding feed:', error);
@@ -134,7 +134,7 @@ async function addFeed(feedUrl, category) {
             await loadActiveFeeds();
             await loadAvailableFeeds();
         } else {
-            showToast(data.message || 'Failed to add feed', 'error');
+            showToast(failureMessage(response, data, data.message || 'Failed to add feed'), 'error');
         }
     } catch (error) {
         console.error('Error adding feed:', error);
@@ -311,6 +311,15 @@ function escapeHtml(text) {
     return div.innerHTML;
 }
 
+function failureMessage(response, data, fallback) {
+    // Rate-limited requests say how long to wait before trying again
+    if (response.status === 429) {
+        const seconds = data.retry_after || response.headers.get('Retry-After');
+        return seconds ? `Too many changes, try again in ${seconds}s` : 'Too many changes, try again shortly';
+    }
+    return fallback;
+}
+
 function getCategoryIcon(category) {
     const icons = {
         'Technology': 'microchip',
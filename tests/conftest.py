@@ -0,0 +1,26 @@
+import os
+
+# Keep the app under test from reading or writing a real snapshot
+os.environ['INTHELOOP_MODE'] = 'standalone'
+os.environ['INTHELOOP_WARM_START'] = 'off'
+
+import pytest
+
+import main
+
+
+@pytest.fixture(autouse=True)
+def isolated_state(tmp_path, monkeypatch):
+    """Point settings files at tmp_path and reset caches and rate limits between tests"""
+    monkeypatch.setattr(main, 'HIDDEN_FEEDS_PATH', str(tmp_path / 'hidden_feeds.txt'))
+    monkeypatch.setattr(main, 'FAVORITES_PATH', str(tmp_path / 'favorites.json'))
+    monkeypatch.setattr(main, 'hidden_feeds', set())
+    main._client_requests.clear()
+    main._global_requests.clear()
+    main._response_cache.clear()
+    yield
+
+
+@pytest.fixture
+def client():
+    return main.app.test_client()
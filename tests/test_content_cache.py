@@ -0,0 +1,23 @@
+import os
+import time
+
+import main
+
+
+def test_prune_content_cache_drops_old_and_excess_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, 'FULLTEXT_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(main, 'FULLTEXT_DISK_MAX_FILES', 2)
+    now = time.time()
+    for name, age_days in [('old', 30), ('a', 3), ('b', 2), ('c', 1)]:
+        path = tmp_path / f'{name}.txt'
+        path.write_text(name)
+        mtime = now - age_days * 24 * 3600
+        os.utime(path, (mtime, mtime))
+
+    assert main.prune_content_cache() == 2
+    assert sorted(os.listdir(tmp_path)) == ['b.txt', 'c.txt']
+
+
+def test_prune_content_cache_without_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, 'FULLTEXT_CACHE_DIR', str(tmp_path / 'missing'))
+    assert main.prune_content_cache() == 0
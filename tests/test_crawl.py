@@ -0,0 +1,129 @@
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+import main
+
+
+class CountingEvent(threading.Event):
+    """Event that counts the threads waiting on it"""
+
+    def __init__(self):
+        super().__init__()
+        self.waiters = 0
+        self.lock = threading.Lock()
+
+    def wait(self, timeout=None):
+        with self.lock:
+            self.waiters += 1
+        return super().wait(timeout)
+
+
+@pytest.fixture
+def stub_crawl(monkeypatch):
+    """Replace crawl_articles with one that blocks until released"""
+    monkeypatch.setattr(main, 'articles_cache', [])
+    monkeypatch.setattr(main, 'cache_timestamp', None)
+    monkeypatch.setattr(main, 'cache_version', 0)
+    monkeypatch.setattr(main, 'crawl_count', 0)
+    monkeypatch.setattr(main, '_crawl_in_flight', None)
+
+    class Stub:
+        started = threading.Event()
+        release = threading.Event()
+        calls = 0
+
+        def __call__(self, active=None):
+            Stub.calls += 1
+            Stub.started.set()
+            assert Stub.release.wait(5)
+            return [{'title': f'crawl {Stub.calls}', 'feed_url': 'http://a/', 'published_ts': 0}]
+
+    stub = Stub()
+    monkeypatch.setattr(main, 'crawl_articles', stub)
+    return stub
+
+
+def start(target, results):
+    thread = threading.Thread(target=lambda: results.append(target()))
+    thread.start()
+    return thread
+
+
+def in_flight_crawl(stub):
+    """Wait for the stubbed crawl to start and swap in an event that counts waiters"""
+    assert stub.started.wait(5)
+    with main._crawl_state_lock:
+        event = CountingEvent()
+        main._crawl_in_flight = event
+    return event
+
+
+def wait_for_waiters(event, count):
+    for _ in range(500):
+        if event.waiters >= count:
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError(f'{event.waiters} of {count} callers joined the crawl')
+
+
+def test_concurrent_refreshes_share_one_crawl(stub_crawl):
+    results = []
+    threads = [start(main.refresh_now, results)]
+    event = in_flight_crawl(stub_crawl)
+    threads += [start(main.refresh_now, results) for _ in range(4)]
+    wait_for_waiters(event, 4)
+
+    stub_crawl.release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert stub_crawl.calls == 1
+    assert main.crawl_count == 1
+    assert sorted(merged for _, merged in results) == [False, True, True, True, True]
+    assert all(articles[0]['title'] == 'crawl 1' for articles, _ in results)
+
+
+def test_stale_articles_are_served_while_crawling(stub_crawl, monkeypatch):
+    stale = [{'title': 'stale', 'feed_url': 'http://a/', 'published_ts': 0}]
+    monkeypatch.setattr(main, 'articles_cache', stale)
+    monkeypatch.setattr(main, 'cache_timestamp', datetime.now() - main.CACHE_TTL - timedelta(seconds=1))
+
+    results = []
+    thread = start(lambda: main.refresh_now(), results)
+    in_flight_crawl(stub_crawl)
+
+    # Readers get the stale list without waiting for the crawl
+    assert main.fetch_articles() is stale
+
+    stub_crawl.release.set()
+    thread.join(5)
+    assert results[0][1] is False
+    assert main.fetch_articles()[0]['title'] == 'crawl 1'
+
+
+def test_cold_cache_readers_wait_for_the_crawl(stub_crawl):
+    results = []
+    threads = [start(main.fetch_articles, results)]
+    event = in_flight_crawl(stub_crawl)
+    threads.append(start(main.fetch_articles, results))
+    wait_for_waiters(event, 1)
+
+    stub_crawl.release.set()
+    for thread in threads:
+        thread.join(5)
+    assert stub_crawl.calls == 1
+    assert [articles[0]['title'] for articles in results] == ['crawl 1', 'crawl 1']
+
+
+def test_holding_the_cache_lock_is_not_a_crawl(stub_crawl):
+    # drop_feed_articles and refresh_feed hold _crawl_lock without crawling
+    stub_crawl.release.set()
+    with main._crawl_lock:
+        results = []
+        thread = start(main.refresh_now, results)
+        assert stub_crawl.started.wait(0.2) is False
+    thread.join(5)
+    assert results == [(main.articles_cache, False)]
+    assert stub_crawl.calls == 1
@@ -0,0 +1,14 @@
+from loadtest import percentile
+
+
+def test_percentile_is_nearest_rank():
+    values = [1, 2, 3, 4, 5]
+    assert percentile(values, 50) == 3
+    assert percentile(values, 90) == 5
+    assert percentile(values, 99) == 5
+    assert percentile(values, 20) == 1
+    assert percentile(values, 0) == 1
+
+
+def test_percentile_of_empty_sample():
+    assert percentile([], 99) == 0.0
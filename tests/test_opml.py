@@ -0,0 +1,53 @@
+import main
+from main import parse_opml
+
+OPML = b"""<?xml version="1.0"?>
+<opml version="2.0">
+  <body>
+    <outline text="Technology">
+      <outline text="A" xmlUrl="http://a/" category="/Tech/News"/>
+      <outline text="B" xmlUrl="http://b/" category="Science"/>
+    </outline>
+    <outline text="Unsorted">
+      <outline text="C" xmlUrl="http://c/"/>
+    </outline>
+    <outline title="D" xmlUrl="http://d/"/>
+  </body>
+</opml>"""
+
+
+def test_parse_opml_categories():
+    assert parse_opml(OPML, 'Finance') == [
+        ('http://a/', 'A', 'Technology'),   # taxonomy path falls back to the folder
+        ('http://b/', 'B', 'Science'),      # a known category attribute wins
+        ('http://c/', 'C', 'Finance'),      # unknown folder falls back to the default
+        ('http://d/', 'D', 'Finance'),
+    ]
+
+
+def test_parse_opml_without_default():
+    assert parse_opml(OPML)[2] == ('http://c/', 'C', None)
+
+
+def test_import_results_follow_file_order(client, monkeypatch):
+    existing = main.rss_feeds['Technology'][0]
+    opml = f"""<opml version="2.0"><body>
+      <outline text="Technology">
+        <outline text="New" xmlUrl="http://new.example/feed"/>
+        <outline text="Old" xmlUrl="{existing}"/>
+        <outline text="Ftp" xmlUrl="ftp://files.example/feed"/>
+        <outline text="Other" xmlUrl="http://other.example/feed"/>
+      </outline>
+    </body></opml>""".encode()
+    monkeypatch.setattr(main, 'validate_feeds', lambda urls: [
+        {'url': url, 'status': 'error', 'error': 'stubbed'} for url in reversed(urls)
+    ])
+
+    response = client.post('/api/feeds/import', data=opml)
+    assert response.status_code == 200
+    assert [(r['url'], r['status']) for r in response.get_json()['results']] == [
+        ('http://new.example/feed', 'error'),
+        (existing, 'skipped'),
+        ('ftp://files.example/feed', 'skipped'),
+        ('http://other.example/feed', 'error'),
+    ]
@@ -0,0 +1,61 @@
+import main
+
+
+def test_feed_edits_have_their_own_budget(client, monkeypatch):
+    monkeypatch.setattr(main, 'refresh_now', lambda: ([], False))
+    per_client = main.RATE_LIMITS['feed_edit'][0]
+    for n in range(per_client):
+        response = client.post('/api/feeds/hide', json={'url': f'http://feed{n}.example/'})
+        assert response.status_code == 200
+
+    assert client.post('/api/feeds/hide', json={'url': 'http://one-more.example/'}).status_code == 429
+    # Feed edits don't use up the crawl budget
+    assert client.get('/api/refresh').status_code == 200
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_refresh_window_slides_and_reports_retry_after(client, monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(main.time, 'monotonic', clock)
+    monkeypatch.setitem(main.RATE_LIMITS, 'refresh', (2, 100))
+    monkeypatch.setattr(main, 'refresh_now', lambda: ([], False))
+
+    assert client.get('/api/refresh').status_code == 200
+    clock.now += 10
+    assert client.get('/api/refresh').status_code == 200
+
+    clock.now += 5
+    response = client.get('/api/refresh')
+    assert response.status_code == 429
+    # The first request leaves the window 45s from now
+    assert response.headers['Retry-After'] == '46'
+    assert response.get_json()['retry_after'] == 46
+
+    clock.now += 45
+    assert client.get('/api/refresh').status_code == 200
+    assert client.get('/api/refresh').status_code == 429
+
+
+def test_global_limit_spans_clients(client, monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(main.time, 'monotonic', clock)
+    monkeypatch.setitem(main.RATE_LIMITS, 'refresh', (5, 3))
+    monkeypatch.setattr(main, 'refresh_now', lambda: ([], False))
+
+    for n in range(3):
+        response = client.get('/api/refresh', environ_base={'REMOTE_ADDR': f'10.0.0.{n}'})
+        assert response.status_code == 200
+    response = client.get('/api/refresh', environ_base={'REMOTE_ADDR': '10.0.0.9'})
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == '61'
+
+    # Rejected requests don't hold a slot
+    clock.now += 60
+    assert client.get('/api/refresh', environ_base={'REMOTE_ADDR': '10.0.0.9'}).status_code == 200
@@ -0,0 +1,35 @@
+import json
+
+import pytest
+
+import main
+
+
+def article(feed_url, ts):
+    return {'title': feed_url, 'link': f'{feed_url}/{ts}', 'feed_url': feed_url, 'published_ts': ts}
+
+
+@pytest.fixture
+def snapshot_path(tmp_path, monkeypatch):
+    path = tmp_path / 'articles_snapshot.json'
+    monkeypatch.setattr(main, 'WARM_START', 'snapshot')
+    monkeypatch.setattr(main, 'SNAPSHOT_PATH', str(path))
+    monkeypatch.setattr(main, '_snapshot', None)
+    monkeypatch.setattr(main, '_snapshot_key', None)
+    monkeypatch.setattr(main, 'cache_timestamp', None)
+    monkeypatch.setattr(main, 'cache_version', 0)
+    monkeypatch.setattr(main, 'articles_cache', [article('http://a/', 2), article('http://b/', 1)])
+    return path
+
+
+def test_hiding_a_feed_updates_the_snapshot(snapshot_path):
+    main.drop_feed_articles('http://a/')
+    saved = json.loads(snapshot_path.read_text())
+    assert [a['feed_url'] for a in saved['articles']] == ['http://b/']
+
+
+def test_adopted_snapshot_leaves_out_hidden_feeds(snapshot_path):
+    main.publish_snapshot(main.articles_cache, None)
+    main.update_hidden_feeds(hide=['http://a/'])
+    main.read_snapshot()
+    assert [a['feed_url'] for a in main.articles_cache] == ['http://b/']
@@ -0,0 +1,36 @@
+from main import SUMMARY_MAX_CHARS, process_summary
+
+
+def test_summary_stays_within_budget_after_block_break():
+    raw = '<p>' + 'x' * 197 + '</p><div></div><p>' + 'hello world ' * 40 + '</p>'
+    text, _, _ = process_summary(raw)
+    assert len(text) <= SUMMARY_MAX_CHARS
+    assert text.endswith('x...')
+
+
+def test_long_summary_is_clipped_at_word_boundary():
+    text, html, _ = process_summary('<p>' + 'hello world ' * 40 + '</p>')
+    assert len(text) <= SUMMARY_MAX_CHARS
+    assert text.endswith('...')
+    assert html.startswith('<p>') and html.endswith('</p>')
+
+
+def test_script_content_is_dropped():
+    text, html, _ = process_summary('<p>Hello<script>alert(1)</script> there</p>')
+    assert text == 'Hello there'
+    assert 'script' not in html
+    assert 'alert' not in html
+
+
+def test_javascript_links_are_dropped():
+    text, html, _ = process_summary('<a href="javascript:alert(1)">click</a> <a href="https://example.com/">ok</a>')
+    assert text == 'click ok'
+    assert 'javascript' not in html
+    assert '<a href="https://example.com/" rel="noopener noreferrer" target="_blank">ok</a>' in html
+
+
+def test_full_text_is_not_clipped():
+    raw = '<p>' + 'hello world ' * 40 + '</p><div>closing remark</div>'
+    text, _, full = process_summary(raw)
+    assert len(text) <= SUMMARY_MAX_CHARS
+    assert full == ('hello world ' * 40).strip() + ' closing remark'